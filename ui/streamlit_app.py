@@ -7,12 +7,16 @@ import streamlit as st
 import asyncio
 from googletrans import Translator
 import time
-import requests
+import httpx
+import diskcache
 import json
 from urllib.parse import quote
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import pandas as pd
+import numpy as np
 import os
+import re
+from collections import namedtuple
 from google.transliteration import transliterate_word
 
 # Page configuration
@@ -60,19 +64,66 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Batch sizes for network calls
+TRANSLATE_BATCH_SIZE = 50  # names per Google Translate request
+WEB_SEARCH_CONCURRENCY = 16  # max in-flight web searches for hospitals missing from the CSV
+
+# DuckDuckGo HTML search endpoint (the html. host serves results directly, with no redirect to follow)
+DDG_URL = "https://html.duckduckgo.com/html/"
+DDG_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+WEB_SEARCH_CACHE_DIR = os.path.join(os.path.dirname(__file__), '.ddg_cache')
+WEB_SEARCH_CACHE_EXPIRE = 7 * 86400  # seconds a found Hindi name stays cached on disk
+WEB_SEARCH_MISS_EXPIRE = 3600  # seconds to remember results that had no usable Hindi name
+_CACHE_MISS = object()  # sentinel: cached None means "searched, nothing found"
+
+# Potential names in pasted text (words that start with capital letters)
+_NAME_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+
+# Hindi text scoring for web search results
+_DEVANAGARI = re.compile(r'[\u0900-\u097F]+(?:\s+[\u0900-\u097F]+)*')
+# Hospital-related Hindi keywords
+_HOSPITAL_KEYWORDS = frozenset(['अस्पताल', 'हॉस्पिटल', 'चिकित्सालय', 'आरोग्यशाला', 'संस्थान', 'महाविद्यालय', 'चिकित्सा', 'आयुर्विज्ञान'])
+_HOSPITAL_KW = re.compile("|".join(map(re.escape, sorted(_HOSPITAL_KEYWORDS))))
+# Common Hindi descriptive/grammatical words to avoid
+_DESCRIPTIVE = frozenset(['का', 'के', 'में', 'है', 'हैं', 'की', 'को', 'से', 'पर', 'तक', 'भी', 'सभी', 'कुछ', 'बहुत', 'यह', 'वह', 'इस', 'उस', 'होता', 'होती', 'होते', 'होतीं'])
+# Common location words that appear in descriptions
+_COMMON = frozenset(['भारत', 'दिल्ली', 'मुंबई', 'बंगलुरु', 'चेन्नई', 'कोलकाता', 'हैदराबाद', 'पुणे', 'अहमदाबाद', 'जयपुर'])
+
 # Initialize session state
 if 'translation_history' not in st.session_state:
     st.session_state.translation_history = []
 
-# Load hospital CSV data
-@st.cache_data
+# Shared Google Translate client, reused across calls and reruns
+@st.cache_resource
+def get_translator():
+    """Create the Translator once so its HTTP client and token are reused"""
+    return Translator()
+
+# Precomputed lookup structures over the hospital CSV, built once per process
+HospitalIndex = namedtuple('HospitalIndex', ['df', 'lab_lower', 'exact_map', 'normalized_map'])
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+def normalize_hospital_name(name):
+    """Lowercase a hospital name and collapse whitespace/punctuation into single spaces"""
+    return _NON_ALNUM.sub(' ', name.lower()).strip()
+
+# Load hospital CSV data (cache_resource: the read-only index is shared, not copied per call)
+@st.cache_resource
 def load_hospital_data():
-    """Load hospital data from CSV file"""
+    """Load hospital data from CSV file and build the lowercase lookup index"""
     try:
         csv_path = os.path.join(os.path.dirname(__file__), 'hospitals_hindi_names_degenericized.csv')
         if os.path.exists(csv_path):
-            df = pd.read_csv(csv_path)
-            return df
+            # Arrow-backed strings keep the .str kernels out of Python object loops
+            df = pd.read_csv(csv_path, dtype='string[pyarrow]', engine='pyarrow')
+            lab_lower = df['lab_name'].str.lower()
+            # Build from the end so the first row wins for duplicate names, like the old .iloc[0]
+            rows = [(lab, hindi) for lab, hindi in zip(lab_lower[::-1], df['hindi_name'][::-1]) if not (pd.isna(lab) or pd.isna(hindi))]
+            exact_map = dict(rows)
+            normalized_map = {normalize_hospital_name(lab): hindi for lab, hindi in rows}
+            normalized_map.pop('', None)
+            return HospitalIndex(df, lab_lower, exact_map, normalized_map)
         else:
             st.error(f"CSV file not found at: {csv_path}")
             return None
@@ -80,43 +131,58 @@ def load_hospital_data():
         st.error(f"Error loading CSV file: {e}")
         return None
 
-def search_hospital_in_csv(hospital_name, hospital_df):
+def search_hospital_in_csv(hospital_name, hospital_index):
     """Search for hospital name in CSV data"""
-    if hospital_df is None:
+    if hospital_index is None:
         return None
     
     # Convert to lowercase for case-insensitive search
     hospital_name_lower = hospital_name.lower()
     
-    # Try exact match first
-    exact_match = hospital_df[hospital_df['lab_name'].str.lower() == hospital_name_lower]
-    if not exact_match.empty:
-        return exact_match.iloc[0]['hindi_name']
+    # Try exact match first (O(1) dict lookup)
+    exact_match = hospital_index.exact_map.get(hospital_name_lower)
+    if exact_match is not None:
+        return exact_match
     
-    # Try partial match (hospital name contains the search term)
-    partial_matches = hospital_df[hospital_df['lab_name'].str.lower().str.contains(hospital_name_lower, na=False)]
-    if not partial_matches.empty:
-        # Return the first match
-        return partial_matches.iloc[0]['hindi_name']
+    # Then ignore whitespace/punctuation differences, e.g. "CHC  Rath." vs "CHC RATH"
+    normalized_name = normalize_hospital_name(hospital_name)
+    if normalized_name:
+        normalized_match = hospital_index.normalized_map.get(normalized_name)
+        if normalized_match is not None:
+            return normalized_match
     
-    # Try reverse search (search term contains hospital name)
-    reverse_matches = hospital_df[hospital_df['lab_name'].str.lower().apply(lambda x: hospital_name_lower in x if pd.notna(x) else False)]
-    if not reverse_matches.empty:
-        return reverse_matches.iloc[0]['hindi_name']
+    # Try partial match (hospital name contains the search term) in a single vectorized pass
+    partial_matches = hospital_index.lab_lower.str.contains(hospital_name_lower, regex=False, na=False).to_numpy(dtype=bool)
+    partial_matches &= hospital_index.df['hindi_name'].notna().to_numpy()  # skip rows with no Hindi name
+    if partial_matches.any():
+        # Return the first match
+        return hospital_index.df['hindi_name'].iloc[partial_matches.argmax()]
     
     return None
 
+@st.cache_data(max_entries=4096, show_spinner=False)
+def google_translate(text):
+    """Translate English text to Hindi; raises on failure so failed calls are not cached"""
+    result = get_translator().translate(text, src='en', dest='hi')
+    if result and result.text:
+        return result.text
+    raise ValueError("Empty translation result")
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def google_translate_batch(texts):
+    """Translate a tuple of single-line English texts in one request, sent as one newline-joined string"""
+    # Translator.translate(list) would still send one request per item, so join the lines ourselves
+    result = get_translator().translate("\n".join(texts), src='en', dest='hi')
+    lines = result.text.split("\n") if result and result.text else []
+    if len(lines) != len(texts):
+        raise ValueError(f"Batch translation returned {len(lines)} lines for {len(texts)} names")
+    return tuple(line.strip() or None for line in lines)
+
 def translate_person_name(name):
     """Translate a person name from English to Hindi using Google Translate with transliteration fallback"""
     try:
         # First try: Google Translate
-        translator = Translator()
-        result = translator.translate(name, src='en', dest='hi')
-        if result and result.text:
-            return result.text
-        else:
-            st.warning(f"Translation service returned empty result for '{name}'. Trying transliteration...")
-            raise Exception("Empty translation result")
+        return google_translate(" ".join(name.split()))
     except Exception as e:
         try:
             # Fallback: Google Transliteration API
@@ -133,131 +199,210 @@ def translate_person_name(name):
 
 def extract_hindi_hospital_name(text, original_hospital_name):
     """Extract Hindi hospital name from text containing Devanagari script"""
-    import re
-    
     # Find all Devanagari script text (Hindi)
-    hindi_pattern = r'[\u0900-\u097F]+(?:\s+[\u0900-\u097F]+)*'
-    hindi_matches = re.findall(hindi_pattern, text)
+    hindi_matches = _DEVANAGARI.findall(text)
     
-    if hindi_matches:
-        # Hospital-related Hindi keywords
-        hospital_keywords = ['अस्पताल', 'हॉस्पिटल', 'चिकित्सालय', 'आरोग्यशाला', 'संस्थान', 'महाविद्यालय', 'चिकित्सा', 'आयुर्विज्ञान']
-        
-        # Common Hindi descriptive/grammatical words to avoid
-        descriptive_words = ['का', 'के', 'में', 'है', 'हैं', 'की', 'को', 'से', 'पर', 'तक', 'भी', 'सभी', 'कुछ', 'बहुत', 'यह', 'वह', 'इस', 'उस', 'होता', 'होती', 'होते', 'होतीं']
-        
-        # Score each Hindi match based on relevance
-        scored_matches = []
-        
-        for hindi_text in hindi_matches:
-            score = 0
-            text_length = len(hindi_text)
-            
-            # Length scoring (prefer names that are not too short or too long)
-            if 8 <= text_length <= 40:
-                score += 3
-            elif 5 <= text_length <= 50:
-                score += 2
-            elif text_length > 50:
-                score -= 2  # Penalize very long text (likely descriptions)
-            
-            # Hospital keyword bonus
-            if any(keyword in hindi_text for keyword in hospital_keywords):
-                score += 5
-            
-            # Penalty for descriptive words
-            descriptive_count = sum(1 for word in descriptive_words if word in hindi_text)
-            score -= descriptive_count * 2
-            
-            # Bonus for proper nouns (words that start with capital letters in context)
-            # This is harder to detect in Hindi, so we use other heuristics
-            
-            # Penalty for common words that appear in descriptions
-            common_words = ['भारत', 'दिल्ली', 'मुंबई', 'बंगलुरु', 'चेन्नई', 'कोलकाता', 'हैदराबाद', 'पुणे', 'अहमदाबाद', 'जयपुर']
-            if any(word in hindi_text for word in common_words) and text_length > 20:
-                score -= 1  # Slight penalty for location names in long text
-            
-            # Only consider matches with positive or neutral scores
-            if score >= 0:
-                scored_matches.append((hindi_text.strip(), score))
-        
-        # Sort by score (highest first) and return the best match
-        if scored_matches:
-            scored_matches.sort(key=lambda x: x[1], reverse=True)
-            return scored_matches[0][0]
+    if not hindi_matches:
+        return None
+    
+    # Score each Hindi match based on relevance, all candidates at once
+    words = [hindi_text.split() for hindi_text in hindi_matches]
+    lengths = np.array([len(hindi_text) for hindi_text in hindi_matches])
+    hospital_hits = np.array([bool(_HOSPITAL_KW.search(hindi_text)) for hindi_text in hindi_matches])
+    descriptive_counts = np.array([sum(1 for word in candidate if word in _DESCRIPTIVE) for candidate in words])
+    common_hits = np.array([not _COMMON.isdisjoint(candidate) for candidate in words])
+    
+    # Length scoring (prefer names that are not too short or too long; very long text is likely a description)
+    scores = np.select(
+        [(lengths >= 8) & (lengths <= 40), (lengths >= 5) & (lengths <= 50), lengths > 50],
+        [3, 2, -2],
+        0
+    )
+    # Hospital keyword bonus
+    scores += 5 * hospital_hits
+    # Penalty for descriptive words
+    scores -= 2 * descriptive_counts
+    # Slight penalty for location names in long text
+    scores -= common_hits & (lengths > 20)
     
+    # Return the highest scoring match (first one on ties), if its score is positive or neutral
+    best = int(np.argmax(scores))
+    if scores[best] >= 0:
+        return hindi_matches[best].strip()
     return None
 
-def duckduckgo_html_search(query: str):
-    """Search using DuckDuckGo HTML interface (like your script)"""
+def parse_ddg_results(html):
+    """Extract result titles and snippets from a DuckDuckGo HTML results page"""
+    tree = LexborHTMLParser(html)
+    results = tree.css(".result__a, .result__snippet")  # titles + snippets
+    return [r.text(strip=True) for r in results]
+
+async def _ddg_async(client, semaphore, query):
+    """Search using DuckDuckGo HTML interface (like your script) on a shared client"""
+    async with semaphore:
+        response = await client.get(DDG_URL, params={"q": query}, headers=DDG_HEADERS)
+    response.raise_for_status()  # rate-limit/error pages must not look like empty results
+    return parse_ddg_results(response.text)
+
+async def _gather_ddg(queries):
+    """Run DuckDuckGo searches concurrently; failed searches come back as exceptions"""
+    # HTTP/2 multiplexes every request over one connection, so connection limits do not
+    # bound the burst; the semaphore caps how many searches are in flight at once
+    semaphore = asyncio.Semaphore(WEB_SEARCH_CONCURRENCY)
+    async with httpx.AsyncClient(http2=True, timeout=15) as client:
+        return await asyncio.gather(*(_ddg_async(client, semaphore, query) for query in queries), return_exceptions=True)
+
+@st.cache_resource
+def get_web_search_cache():
+    """On-disk cache of Hindi names found by web search, keyed by normalized hospital name"""
     try:
-        url = "https://duckduckgo.com/html/"
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-        params = {"q": query}
-        response = requests.get(url, headers=headers, params=params, timeout=15)
-        soup = BeautifulSoup(response.text, "html.parser")
-        results = soup.select(".result__a, .result__snippet")  # titles + snippets
-        return [r.get_text(strip=True) for r in results]
+        return diskcache.Cache(WEB_SEARCH_CACHE_DIR)
     except Exception as e:
-        st.error(f"Error in HTML search: {e}")
-        return []
+        # A read-only deploy or full disk must not break lookups; search uncached instead
+        st.warning(f"Web search cache unavailable, searching without it: {e}")
+        return None
 
-def search_hospital_name(hospital_name):
-    """Search for hospital name using CSV first, then web search as fallback"""
+def _read_web_search_cache(cache, key):
+    """Cached Hindi name for key, or _CACHE_MISS if absent or the cache can't be read"""
+    if cache is None:
+        return _CACHE_MISS
     try:
-        # First, try to find the hospital in the CSV file
-        hospital_df = load_hospital_data()
-        if hospital_df is not None:
-            csv_result = search_hospital_in_csv(hospital_name, hospital_df)
-            if csv_result:
-                return f"From Database: {csv_result}"
-        
-        # If not found in CSV, fall back to web search
-        st.info(f"'{hospital_name}' not found in database. Searching online...")
-        
+        return cache.get(key, default=_CACHE_MISS)
+    except Exception:
+        return _CACHE_MISS
+
+def _write_web_search_cache(cache, key, hindi_hospital_name, expire):
+    """Store a looked-up Hindi name, skipping it if the cache can't be written"""
+    if cache is None:
+        return
+    try:
+        cache.set(key, hindi_hospital_name, expire=expire)
+    except Exception:
+        pass
+
+def find_hindi_names_online(hospital_names):
+    """Find Hindi hospital names in web search results, searching only names not seen before"""
+    cache = get_web_search_cache()
+    # Key on the lowercased, whitespace-collapsed name so repeats skip the network
+    keys = {hospital_name: " ".join(hospital_name.lower().split()) for hospital_name in hospital_names}
+    found = {}
+    for key in dict.fromkeys(keys.values()):
+        cached = _read_web_search_cache(cache, key)
+        if cached is not _CACHE_MISS:
+            found[key] = cached
+    pending = [key for key in dict.fromkeys(keys.values()) if key not in found]
+    
+    if pending:
         # Using DuckDuckGo HTML search (like your script) for better results
-        search_query = f"official hindi name of {hospital_name}"
-        search_results = duckduckgo_html_search(search_query)
-        
-        # Combine all search results text
-        all_text = " ".join(search_results[:10])  # Use first 10 results
+        search_queries = [f"official hindi name of {key}" for key in pending]
+        searches = _gather_ddg(search_queries)
+        try:
+            all_search_results = asyncio.run(searches)
+        except Exception as e:
+            # Errors outside the individual requests (client setup/teardown, an already running
+            # event loop) fail every pending search; report once and let callers fall back
+            searches.close()
+            st.error(f"Error in HTML search: {e}")
+            all_search_results = []
         
-        # Try to extract Hindi hospital name
-        if all_text:
-            hindi_hospital_name = extract_hindi_hospital_name(all_text, hospital_name)
-            if hindi_hospital_name:
-                return f"From Web Search: {hindi_hospital_name}"
+        for key, search_results in zip(pending, all_search_results):
+            if isinstance(search_results, Exception):
+                # Failed searches are not cached so they are retried next time
+                st.error(f"Error in HTML search: {search_results}")
+                continue
+            
+            # Combine all search results text
+            all_text = " ".join(search_results[:10])  # Use first 10 results
+            if not all_text:
+                # An empty results page is often an anomaly/rate-limit page, so don't cache it
+                continue
+            
+            # Try to extract Hindi hospital name; the extracted name is cached so hits skip scoring too
+            hindi_hospital_name = extract_hindi_hospital_name(all_text, key)
+            found[key] = hindi_hospital_name
+            expire = WEB_SEARCH_CACHE_EXPIRE if hindi_hospital_name else WEB_SEARCH_MISS_EXPIRE
+            _write_web_search_cache(cache, key, hindi_hospital_name, expire)
+    
+    return {hospital_name: found.get(key) for hospital_name, key in keys.items()}
+
+def search_hospitals_online(hospital_names):
+    """Search for hospital names on the web, falling back to Google Translate"""
+    hindi_hospital_names = find_hindi_names_online(hospital_names)
+    results = []
+    for hospital_name in hospital_names:
+        hindi_hospital_name = hindi_hospital_names[hospital_name]
+        if hindi_hospital_name:
+            results.append(f"From Web Search: {hindi_hospital_name}")
+            continue
         
         # Final fallback: try Google Translate for hospital name
-        translator = Translator()
-        result = translator.translate(hospital_name, src='en', dest='hi')
-        return f"Translated: {result.text}"
-        
-    except Exception as e:
-        st.error(f"Error searching for hospital {hospital_name}: {e}")
-        # Fallback to Google Translate
         try:
-            translator = Translator()
-            result = translator.translate(hospital_name, src='en', dest='hi')
-            return f"Translated: {result.text}"
-        except:
-            return hospital_name
+            results.append(f"Translated: {google_translate(' '.join(hospital_name.split()))}")
+        except Exception as e:
+            st.error(f"Error searching for hospital {hospital_name}: {e}")
+            results.append(hospital_name)
+    return results
+
+def search_hospital_name(hospital_name):
+    """Search for hospital name using CSV first, then web search as fallback"""
+    # First, try to find the hospital in the CSV file
+    hospital_index = load_hospital_data()
+    csv_result = search_hospital_in_csv(hospital_name, hospital_index)
+    if csv_result:
+        return f"From Database: {csv_result}"
+    
+    # If not found in CSV, fall back to web search
+    st.info(f"'{hospital_name}' not found in database. Searching online...")
+    return search_hospitals_online([hospital_name])[0]
+
+def translate_person_names(names):
+    """Translate person names with one Google Translate request per chunk of unique names"""
+    unique_names = list(dict.fromkeys(names))
+    translated = {}
+    for start in range(0, len(unique_names), TRANSLATE_BATCH_SIZE):
+        chunk = unique_names[start:start + TRANSLATE_BATCH_SIZE]
+        try:
+            # Collapse whitespace so a name never spans lines of the joined request
+            translated.update(zip(chunk, google_translate_batch(tuple(" ".join(name.split()) for name in chunk))))
+        except Exception:
+            # A failed or misaligned chunk goes through the single-name path and its fallbacks below
+            pass
+    hindi_names = {name: translated.get(name) or translate_person_name(name) for name in unique_names}
+    return [hindi_names[name] for name in names]
+
+def search_hospital_names(hospital_names):
+    """Search hospital names in the CSV first, then run the web searches for the misses concurrently"""
+    hospital_index = load_hospital_data()
+    results = {}
+    misses = []
+    for hospital_name in dict.fromkeys(hospital_names):
+        csv_result = search_hospital_in_csv(hospital_name, hospital_index)
+        if csv_result:
+            results[hospital_name] = f"From Database: {csv_result}"
+        else:
+            misses.append(hospital_name)
+    
+    if misses:
+        st.info(f"{len(misses)} hospital(s) not found in database. Searching online...")
+        results.update(zip(misses, search_hospitals_online(misses)))
+    
+    return [results[hospital_name] for hospital_name in hospital_names]
 
 def translate_names_batch(names, category):
     """Translate multiple names from English to Hindi based on category"""
-    results = []
-    for name in names:
-        if name.strip():  # Skip empty names
-            if category == "Person Name":
-                hindi_name = translate_person_name(name.strip())
-            else:  # Hospital
-                hindi_name = search_hospital_name(name.strip())
-            results.append({
-                'english': name.strip(),
-                'hindi': hindi_name,
-                'category': category
-            })
-    return results
+    names = [name.strip() for name in names if name.strip()]  # Skip empty names
+    if category == "Person Name":
+        hindi_names = translate_person_names(names)
+    else:  # Hospital
+        hindi_names = search_hospital_names(names)
+    return [
+        {
+            'english': name,
+            'hindi': hindi_name,
+            'category': category
+        }
+        for name, hindi_name in zip(names, hindi_names)
+    ]
 
 def display_translation_result(english_name, hindi_name, category=None):
     """Display a single translation result"""
@@ -413,14 +558,11 @@ def main():
             if st.button("🔍 Extract and Process Names"):
                 if pasted_text:
                     # Simple name extraction (you can improve this)
-                    import re
-                    # Extract potential names (words that start with capital letters)
-                    potential_names = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', pasted_text)
+                    # Extract potential names (words that start with capital letters),
+                    # removing duplicates while preserving order
+                    unique_names = list(dict.fromkeys(_NAME_RE.findall(pasted_text)))
                     
-                    if potential_names:
-                        # Remove duplicates while preserving order
-                        unique_names = list(dict.fromkeys(potential_names))
-                        
+                    if unique_names:
                         with st.spinner(f"Processing {len(unique_names)} {category.lower()}s..."):
                             results = translate_names_batch(unique_names, category)
                             